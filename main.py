@@ -1,15 +1,68 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List
-from datetime import date, timedelta, datetime
-from sqlalchemy import create_engine, Column, Integer, String, Date, Enum, ForeignKey, DateTime, and_, or_
-from sqlalchemy.orm import sessionmaker, declarative_base, relationship
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, StringConstraints, field_validator
+from typing import Annotated, Optional, List
+from datetime import date
+from functools import lru_cache
+from sqlalchemy import Column, Integer, String, Date, CheckConstraint, ForeignKey, DateTime, Enum, Index, func, select, exists, delete, update, event, bindparam, text, inspect
+from sqlalchemy.schema import AddConstraint
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, relationship
 import enum
 import os
-
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./leave_mvp.sqlite3")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+import re
+
+try:  # optional: only speeds up bulk recomputation
+    import numpy as np
+except ImportError:
+    np = None
+
+try:  # optional: C-level JSON encoding of responses (dates included)
+    import orjson
+except ImportError:
+    orjson = None
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./leave_mvp.sqlite3")
+# Accept plain driver-less URLs (e.g. from a hosting provider) and map them to the async drivers
+if DATABASE_URL.startswith("sqlite://"):
+    DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+elif DATABASE_URL.startswith(("postgres://", "postgresql://")):
+    DATABASE_URL = "postgresql+asyncpg://" + DATABASE_URL.split("://", 1)[1]
+
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_async_engine(DATABASE_URL, query_cache_size=1200)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        # WAL lets readers proceed during writes; NORMAL sync is durable enough under WAL
+        cur = dbapi_conn.cursor()
+        for pragma in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA mmap_size=268435456",  # 256 MiB
+            "PRAGMA cache_size=-65536",  # 64 MiB
+            "PRAGMA temp_store=MEMORY",
+        ):
+            cur.execute(pragma)
+        cur.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _sqlite_begin(conn):
+        # The driver normally begins lazily at the first write, so plain SELECTs never hold a snapshot that a
+        # concurrent writer could invalidate. Transactions whose reads must stay consistent with their writes
+        # (rebuild_leave_balances) opt in via execution option and take the write lock up front instead.
+        if conn.get_execution_options().get("sqlite_immediate"):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+else:
+    # Keep a warm pool of connections for networked databases; drop stale ones before use
+    engine = create_async_engine(
+        DATABASE_URL, query_cache_size=1200, pool_size=20, max_overflow=10, pool_pre_ping=True, pool_recycle=3600,
+    )
+# expire_on_commit=False: handlers return ORM objects after commit, and async sessions cannot lazy-refresh them
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 DEFAULT_ANNUAL_BALANCE = 20  # days per calendar year for MVP
@@ -29,44 +82,117 @@ class Employee(Base):
     # For MVP, store a simple annual balance (resets Jan 1). Could be expanded to accruals later.
     annual_balance = Column(Integer, default=DEFAULT_ANNUAL_BALANCE, nullable=False)
 
-    leaves = relationship("Leave", back_populates="employee", cascade="all, delete-orphan")
+    # No endpoint walks these relationships; raise instead of silently issuing N+1 lazy loads.
+    # Code that needs them must eager-load explicitly, e.g. .options(selectinload(Leave.employee)).
+    leaves = relationship("Leave", back_populates="employee", cascade="all, delete-orphan", lazy="raise_on_sql")
 
 class Leave(Base):
     __tablename__ = "leaves"
+    # Covers the hot (employee, status, date range) predicate used by overlap and balance checks;
+    # its leading column also serves plain employee_id lookups, so that column needs no index of its own.
+    __table_args__ = (
+        Index("ix_leaves_emp_status_dates", "employee_id", "status", "start_date", "end_date"),
+        CheckConstraint(
+            "status IN (" + ", ".join(f"'{s.value}'" for s in LeaveStatus) + ")", name="ck_leaves_status"
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
-    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     days = Column(Integer, nullable=False)  # computed as working days for MVP (excl Sat/Sun)
     reason = Column(String, nullable=True)
-    status = Column(Enum(LeaveStatus), default=LeaveStatus.pending, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-
-    employee = relationship("Employee", back_populates="leaves")
-
-Base.metadata.create_all(bind=engine)
+    # Plain string (values of LeaveStatus) instead of Enum: no per-row enum coercion on fetch or bind
+    status = Column(String(10), default=LeaveStatus.pending.value, nullable=False, index=True)
+    # Stamped by the database: default/onupdate render now() into the INSERT/UPDATE rather than computing it in
+    # Python (tables created by older versions have no server default), server_default covers raw SQL inserts
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
 
-app = FastAPI(title="Leave Management System MVP", version="0.1.0")
+    employee = relationship("Employee", back_populates="leaves", lazy="raise_on_sql")
+
+class LeaveBalance(Base):
+    """Running total of approved leave days per employee and calendar year, maintained on approval."""
+    __tablename__ = "leave_balance"
+    employee_id = Column(Integer, ForeignKey("employees.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    used_days = Column(Integer, default=0, nullable=False)
+
+def _upgrade_schema(conn):
+    """Bring tables created by an older version up to date; create_all only creates missing tables."""
+    if conn.dialect.name == "postgresql":
+        insp = inspect(conn)
+        cols = {c["name"]: c for c in insp.get_columns("leaves")}
+        if isinstance(cols["status"]["type"], Enum):
+            # Older versions stored status as a native enum type; comparing it against strings fails
+            conn.exec_driver_sql("ALTER TABLE leaves ALTER COLUMN status TYPE VARCHAR(10) USING status::text")
+            conn.exec_driver_sql("DROP TYPE IF EXISTS leavestatus")
+        if "ck_leaves_status" not in {c["name"] for c in insp.get_check_constraints("leaves")}:
+            conn.execute(AddConstraint(next(c for c in Leave.__table__.constraints if c.name == "ck_leaves_status")))
+        for name in ("created_at", "updated_at"):
+            if not cols[name]["type"].timezone:
+                # Older versions stored naive datetime.utcnow() values
+                conn.exec_driver_sql(
+                    f"ALTER TABLE leaves ALTER COLUMN {name} TYPE TIMESTAMP WITH TIME ZONE USING {name} AT TIME ZONE 'UTC'"
+                )
+            if cols[name]["default"] is None:
+                conn.exec_driver_sql(f"ALTER TABLE leaves ALTER COLUMN {name} SET DEFAULT now()")
+    # SQLite cannot add a CHECK constraint to an existing table; see "Upgrading an existing database" in the README
+    for index in Leave.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    # Superseded by ix_leaves_emp_status_dates (same leading column)
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_leaves_employee_id")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+    # One-off migration: backfill the running totals from existing approved leaves. The unlocked check keeps
+    # normal startups lock-free; the rebuild re-checks under its lock, so concurrent workers backfill only once.
+    async with SessionLocal() as sess:
+        empty = not (await sess.execute(select(exists().select_from(LeaveBalance)))).scalar()
+    if empty:
+        async with SessionLocal() as sess:
+            await rebuild_leave_balances(sess, only_if_empty=True)
+    yield
+    await engine.dispose()
+
+app = FastAPI(
+    title="Leave Management System MVP",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 # ------------ Schemas ------------
 
+# RFC-light email check: compiled once at import, no DNS/deliverability lookups per request
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
 class EmployeeCreate(BaseModel):
     name: str
-    email: EmailStr
+    email: Annotated[str, StringConstraints(pattern=EMAIL_RE.pattern)]
     department: str
     joining_date: date
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v):
+        # Emails are stored and deduped lowercase
+        return v.lower()
+
 class EmployeeOut(BaseModel):
     id: int
     name: str
-    email: EmailStr
+    email: str
     department: str
     joining_date: date
     annual_balance: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 class LeaveApply(BaseModel):
     employee_id: int
@@ -94,8 +220,7 @@ class LeaveOut(BaseModel):
     reason: Optional[str]
     status: LeaveStatus
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 class BalanceOut(BaseModel):
     employee_id: int
@@ -104,207 +229,380 @@ class BalanceOut(BaseModel):
     annual_allocation: int
     year: int
 
+class RecomputeOut(BaseModel):
+    checked: int
+    updated: int
+
 # ------------ Helpers ------------
 
+# WEEKDAYS_IN_TAIL[start_wd][rem]: working days in the `rem` (< 7) days starting on weekday `start_wd` (0=Mon..6=Sun)
+WEEKDAYS_IN_TAIL = [
+    [sum(1 for i in range(rem) if (start_wd + i) % 7 < 5) for rem in range(7)]
+    for start_wd in range(7)
+]
+
+@lru_cache(maxsize=4096)
 def working_days(start: date, end: date) -> int:
     """Count working days (Mon-Fri) inclusive. Excludes Sat/Sun. No holiday calendar for MVP."""
     if end < start:
         raise ValueError("end_date cannot be before start_date")
-    day_count = 0
-    cur = start
-    while cur <= end:
-        if cur.weekday() < 5:  # 0=Mon..4=Fri
-            day_count += 1
-        cur += timedelta(days=1)
-    return day_count
+    # Closed form: every full week contributes 5 working days, the remainder comes from the lookup table
+    full_weeks, rem = divmod((end - start).days + 1, 7)
+    return full_weeks * 5 + WEEKDAYS_IN_TAIL[start.weekday()][rem]
+
+def working_days_bulk(starts, ends) -> List[int]:
+    """working_days over parallel sequences of dates (end >= start), vectorized with numpy when available."""
+    if np is None:
+        return [working_days(s, e) for s, e in zip(starts, ends)]
+    starts = np.asarray(starts, dtype="datetime64[D]")
+    ends = np.asarray(ends, dtype="datetime64[D]")
+    # Same contract as working_days; busday_count would silently return 0 or negative counts instead
+    if (ends < starts).any():
+        raise ValueError("end_date cannot be before start_date")
+    # busday_count excludes the end date, so shift it by one day; default weekmask is Mon-Fri
+    return np.busday_count(starts, ends + np.timedelta64(1, "D")).tolist()
+
+@lru_cache(maxsize=64)
+def _year_workday_mask(year: int) -> int:
+    """Bitmap of the year as a Python int: bit i is set iff Jan 1 + i days is a working day (Mon-Fri)."""
+    jan1_wd = date(year, 1, 1).weekday()
+    n_days = (date(year, 12, 31) - date(year, 1, 1)).days + 1
+    mask = 0
+    for i in range(n_days):
+        if (jan1_wd + i) % 7 < 5:
+            mask |= 1 << i
+    return mask
+
+def working_days_in_year(start: date, end: date) -> int:
+    """working_days for a range inside one calendar year: popcount of a slice of the cached year bitmap."""
+    if start.year != end.year:
+        raise ValueError("start_date and end_date must fall in the same calendar year")
+    if end < start:
+        raise ValueError("end_date cannot be before start_date")
+    jan1 = date(start.year, 1, 1)
+    lo, hi = (start - jan1).days, (end - jan1).days + 1
+    return ((_year_workday_mask(start.year) >> lo) & ((1 << (hi - lo)) - 1)).bit_count()
 
 def get_year_bounds(d: date):
     return date(d.year, 1, 1), date(d.year, 12, 31)
 
-def compute_used_days(sess, emp_id: int, year: int) -> int:
-    """Sum approved leave days in the given calendar year for the employee."""
-    y_start, y_end = date(year, 1, 1), date(year, 12, 31)
-    leaves = sess.query(Leave).filter(
-        Leave.employee_id == emp_id,
-        Leave.status == LeaveStatus.approved,
-        or_(
-            and_(Leave.start_date >= y_start, Leave.start_date <= y_end),
-            and_(Leave.end_date >= y_start, Leave.end_date <= y_end),
-            and_(Leave.start_date <= y_start, Leave.end_date >= y_end),
-        )
-    ).all()
-
-    used = 0
-    for lv in leaves:
-        # Clip to year
-        s = max(lv.start_date, y_start)
-        e = min(lv.end_date, y_end)
-        used += working_days(s, e)
-    return used
-
-def has_overlap(sess, emp_id: int, start: date, end: date) -> bool:
-    """Check overlap with existing PENDING or APPROVED leaves."""
-    q = sess.query(Leave).filter(
-        Leave.employee_id == emp_id,
-        Leave.status.in_([LeaveStatus.pending, LeaveStatus.approved]),
-        or_(
-            and_(Leave.start_date <= end, Leave.end_date >= start),  # ranges intersect
-        )
+# INSERT construct with ON CONFLICT support for the configured backend
+dialect_insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+
+def _days_by_year(start: date, end: date, days: int) -> dict:
+    """Split a leave's days per calendar year. Only legacy leaves cross a year; those are clipped and recounted."""
+    if start.year == end.year:
+        return {start.year: days}
+    return {
+        y: working_days_in_year(max(start, date(y, 1, 1)), min(end, date(y, 12, 31)))
+        for y in range(start.year, end.year + 1)
+    }
+
+def _used_days_subquery():
+    """Scalar SELECT of the running used-days total (0 when no leave was approved that year).
+    Binds: emp_id, year."""
+    return select(func.coalesce(
+        select(LeaveBalance.used_days)
+        .where(LeaveBalance.employee_id == bindparam("emp_id"), LeaveBalance.year == bindparam("year"))
+        .scalar_subquery(),
+        0,
+    ))
+
+async def _add_year_used_days(sess: AsyncSession, emp_id: int, year: int, days: int, limit: Optional[int] = None) -> bool:
+    """Upsert `days` onto one (employee, year) running total; with `limit`, only if the new total stays within it."""
+    if limit is not None and days > limit:
+        return False
+    stmt = dialect_insert(LeaveBalance).values(employee_id=emp_id, year=year, used_days=days)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LeaveBalance.employee_id, LeaveBalance.year],
+        set_={"used_days": LeaveBalance.used_days + stmt.excluded.used_days},
+        where=None if limit is None else LeaveBalance.used_days + stmt.excluded.used_days <= limit,
+    )
+    return (await sess.execute(stmt)).rowcount != 0
+
+async def add_used_days(sess: AsyncSession, emp_id: int, start: date, end: date, days: int, limit: int) -> bool:
+    """Add an approved leave to the running totals unless a year's total would exceed `limit`.
+
+    Each year is a single conditional upsert, so the balance check and the increment are atomic: concurrent
+    approvals cannot both pass. Returns False when a year is over the limit; the caller must then roll back,
+    as earlier years of a (legacy) multi-year leave may already have been added. Runs in the caller's transaction."""
+    for year, year_days in _days_by_year(start, end, days).items():
+        if not await _add_year_used_days(sess, emp_id, year, year_days, limit):
+            return False
+    return True
+
+async def rebuild_leave_balances(sess: AsyncSession, only_if_empty: bool = False):
+    """Recompute leave_balance from the approved leaves (source of truth) and commit.
+
+    Must start a fresh transaction. The table is locked for the whole rebuild, so approvals (which upsert
+    leave_balance before marking the leave approved) and other rebuilds wait instead of being lost or
+    colliding. With `only_if_empty`, nothing happens if the table already has rows once the lock is held."""
+    if engine.dialect.name == "postgresql":
+        await sess.execute(text("LOCK TABLE leave_balance IN EXCLUSIVE MODE"))
+    else:
+        await sess.connection(execution_options={"sqlite_immediate": True})
+    if only_if_empty and (await sess.execute(select(exists().select_from(LeaveBalance)))).scalar():
+        await sess.rollback()
+        return
+
+    totals = {}
+    approved = await sess.execute(
+        select(Leave.employee_id, Leave.start_date, Leave.end_date, Leave.days)
+        .where(Leave.status == LeaveStatus.approved.value)
+    )
+    for emp_id, start, end, days in approved:
+        for year, year_days in _days_by_year(start, end, days).items():
+            totals[emp_id, year] = totals.get((emp_id, year), 0) + year_days
+
+    await sess.execute(delete(LeaveBalance))
+    sess.add_all(
+        LeaveBalance(employee_id=emp_id, year=year, used_days=used)
+        for (emp_id, year), used in totals.items()
+    )
+    await sess.commit()
+
+async def bulk_create_leaves(sess: AsyncSession, rows: List[dict]):
+    """Import many leaves in one executemany INSERT and a single commit (migrations, HR-system sync).
+
+    Each row holds Leave column values; a missing `days` is computed from the dates. Rows that collide with an
+    existing primary key are skipped, so re-running an import with explicit ids is idempotent. Approved rows
+    are not validated against balances; the inserted ones are added to the affected leave_balance totals
+    with atomic upserts in the same transaction."""
+    if not rows:
+        return
+    rows = [dict(r) for r in rows]  # don't mutate the caller's dicts when filling in `days`
+    missing = [r for r in rows if r.get("days") is None]
+    for r, d in zip(missing, working_days_bulk([r["start_date"] for r in missing], [r["end_date"] for r in missing])):
+        r["days"] = d
+    # RETURNING yields only the rows actually inserted, so skipped duplicates are not counted twice
+    inserted = await sess.execute(
+        dialect_insert(Leave).on_conflict_do_nothing()
+        .returning(Leave.employee_id, Leave.start_date, Leave.end_date, Leave.days, Leave.status),
+        rows,
     )
-    return sess.query(q.exists()).scalar()
+    totals = {}
+    for emp_id, start, end, days, status in inserted:
+        if status == LeaveStatus.approved.value:
+            for year, year_days in _days_by_year(start, end, days).items():
+                totals[emp_id, year] = totals.get((emp_id, year), 0) + year_days
+    for (emp_id, year), used in totals.items():
+        await _add_year_used_days(sess, emp_id, year, used)
+    await sess.commit()
+
+def _overlap_exists(exclude_self: bool = False):
+    """EXISTS over PENDING or APPROVED leaves of the employee intersecting [start, end].
+    Binds: emp_id, start, end (and exclude_id when `exclude_self`, to skip the leave being decided)."""
+    criteria = [
+        Leave.employee_id == bindparam("emp_id"),
+        Leave.status.in_([LeaveStatus.pending.value, LeaveStatus.approved.value]),
+        Leave.start_date <= bindparam("end"),  # ranges intersect
+        Leave.end_date >= bindparam("start"),
+    ]
+    if exclude_self:
+        criteria.append(Leave.id != bindparam("exclude_id"))
+    return exists().where(*criteria)
+
+# Hot statements are built once and only re-bound per call, so SQLAlchemy's compiled cache
+# (query_cache_size) serves them without re-constructing and re-keying the expression tree.
+_USED_DAYS_STMT = _used_days_subquery()
+_OVERLAP_STMT = select(_overlap_exists())
+_OVERLAP_EXCLUDING_STMT = select(_overlap_exists(exclude_self=True))
+_APPLY_CHECKS_STMT = select(
+    Employee.id,
+    Employee.annual_balance,
+    Employee.joining_date,
+    _overlap_exists().label("overlap"),
+    _used_days_subquery().scalar_subquery().label("used"),
+).where(Employee.id == bindparam("emp_id"))
+_BALANCE_STMT = select(
+    Employee.annual_balance,
+    Employee.joining_date,
+    _used_days_subquery().scalar_subquery().label("used"),
+).where(Employee.id == bindparam("emp_id"))
+
+async def compute_used_days(sess: AsyncSession, emp_id: int, year: int) -> int:
+    """Approved leave days in the given calendar year for the employee (primary-key lookup of the running total)."""
+    return (await sess.execute(_USED_DAYS_STMT, {"emp_id": emp_id, "year": year})).scalar()
+
+async def has_overlap(sess: AsyncSession, emp_id: int, start: date, end: date, exclude_id: Optional[int] = None) -> bool:
+    """Check overlap with existing PENDING or APPROVED leaves (other than `exclude_id`)."""
+    params = {"emp_id": emp_id, "start": start, "end": end}
+    if exclude_id is None:
+        return (await sess.execute(_OVERLAP_STMT, params)).scalar()
+    return (await sess.execute(_OVERLAP_EXCLUDING_STMT, {**params, "exclude_id": exclude_id})).scalar()
+
+async def get_db():
+    """FastAPI dependency: one session per request, returning its connection to the pool afterwards."""
+    async with SessionLocal() as sess:
+        yield sess
 
 # ------------ Endpoints ------------
 
 @app.post("/employees", response_model=EmployeeOut, status_code=201)
-def add_employee(payload: EmployeeCreate):
-    sess = SessionLocal()
-    try:
-        # Simple dedupe by email
-        existing = sess.query(Employee).filter_by(email=str(payload.email).lower()).first()
-        if existing:
-            raise HTTPException(status_code=409, detail="Employee with this email already exists.")
-        emp = Employee(
-            name=payload.name.strip(),
-            email=str(payload.email).lower(),
-            department=payload.department.strip(),
-            joining_date=payload.joining_date,
-            annual_balance=DEFAULT_ANNUAL_BALANCE,
-        )
-        if emp.joining_date > date.today():
-            # Allowed; but they can't apply leave before joining. Just store.
-            pass
-        sess.add(emp)
-        sess.commit()
-        sess.refresh(emp)
-        return emp
-    finally:
-        sess.close()
+async def add_employee(payload: EmployeeCreate, sess: AsyncSession = Depends(get_db)):
+    # Simple dedupe by email
+    existing = (await sess.execute(select(Employee.id).filter_by(email=payload.email))).first()
+    if existing:
+        raise HTTPException(status_code=409, detail="Employee with this email already exists.")
+    emp = Employee(
+        name=payload.name.strip(),
+        email=payload.email,
+        department=payload.department.strip(),
+        joining_date=payload.joining_date,
+        annual_balance=DEFAULT_ANNUAL_BALANCE,
+    )
+    if emp.joining_date > date.today():
+        # Allowed; but they can't apply leave before joining. Just store.
+        pass
+    sess.add(emp)
+    await sess.commit()
+    await sess.refresh(emp)
+    return emp
 
 @app.get("/employees/{employee_id}/balance", response_model=BalanceOut)
-def get_balance(employee_id: int, year: Optional[int] = None):
-    sess = SessionLocal()
-    try:
-        emp = sess.query(Employee).filter_by(id=employee_id).first()
-        if not emp:
-            raise HTTPException(status_code=404, detail="Employee not found.")
-        year = year or date.today().year
-        used = compute_used_days(sess, emp.id, year)
-        allocation = emp.annual_balance if emp.joining_date.year <= year else 0
-        available = max(allocation - used, 0)
-        return BalanceOut(
-            employee_id=emp.id,
-            available_days=available,
-            used_days=used,
-            annual_allocation=allocation,
-            year=year,
-        )
-    finally:
-        sess.close()
+async def get_balance(employee_id: int, year: Optional[int] = None, sess: AsyncSession = Depends(get_db)):
+    year = year or date.today().year
+    # Allocation inputs and the used-days total in one round-trip, without hydrating an Employee
+    emp = (await sess.execute(_BALANCE_STMT, {"emp_id": employee_id, "year": year})).one_or_none()
+    if not emp:
+        raise HTTPException(status_code=404, detail="Employee not found.")
+    allocation = emp.annual_balance if emp.joining_date.year <= year else 0
+    available = max(allocation - emp.used, 0)
+    return BalanceOut(
+        employee_id=employee_id,
+        available_days=available,
+        used_days=emp.used,
+        annual_allocation=allocation,
+        year=year,
+    )
 
 @app.post("/leaves/apply", response_model=LeaveOut, status_code=201)
-def apply_leave(payload: LeaveApply):
-    sess = SessionLocal()
-    try:
-        emp = sess.query(Employee).filter_by(id=payload.employee_id).first()
-        if not emp:
-            raise HTTPException(status_code=404, detail="Employee not found.")
-
-        if payload.end_date < payload.start_date:
-            raise HTTPException(status_code=400, detail="Invalid dates: end_date before start_date.")
-
-        if payload.start_date < emp.joining_date:
-            raise HTTPException(status_code=400, detail="Cannot apply for leave before joining date.")
-
-        if has_overlap(sess, emp.id, payload.start_date, payload.end_date):
-            raise HTTPException(status_code=409, detail="Overlapping with existing pending/approved leave.")
-
-        days = working_days(payload.start_date, payload.end_date)
-        if days <= 0:
-            raise HTTPException(status_code=400, detail="No working days in the selected range.")
-
-        # Check balance in the year(s). For MVP, restrict to same calendar year.
-        if payload.start_date.year != payload.end_date.year:
-            raise HTTPException(status_code=400, detail="For MVP, leave cannot span multiple calendar years.")
-
-        used = compute_used_days(sess, emp.id, payload.start_date.year)
-        available = max(emp.annual_balance - used, 0)
-        if days > available:
-            raise HTTPException(status_code=400, detail=f"Requested {days} days exceeds available balance {available}.")
-
-        leave = Leave(
-            employee_id=emp.id,
-            start_date=payload.start_date,
-            end_date=payload.end_date,
-            days=days,
-            reason=payload.reason,
-            status=LeaveStatus.pending
-        )
-        sess.add(leave)
-        sess.commit()
-        sess.refresh(leave)
-        return leave
-    finally:
-        sess.close()
+async def apply_leave(payload: LeaveApply, sess: AsyncSession = Depends(get_db)):
+    # Fetch the employee together with the overlap and used-days checks in a single round-trip
+    emp = (await sess.execute(_APPLY_CHECKS_STMT, {
+        "emp_id": payload.employee_id,
+        "start": payload.start_date,
+        "end": payload.end_date,
+        "year": payload.start_date.year,
+    })).one_or_none()
+    if not emp:
+        raise HTTPException(status_code=404, detail="Employee not found.")
+
+    if payload.end_date < payload.start_date:
+        raise HTTPException(status_code=400, detail="Invalid dates: end_date before start_date.")
+
+    if payload.start_date < emp.joining_date:
+        raise HTTPException(status_code=400, detail="Cannot apply for leave before joining date.")
+
+    if emp.overlap:
+        raise HTTPException(status_code=409, detail="Overlapping with existing pending/approved leave.")
+
+    days = working_days(payload.start_date, payload.end_date)
+    if days <= 0:
+        raise HTTPException(status_code=400, detail="No working days in the selected range.")
+
+    # Check balance in the year(s). For MVP, restrict to same calendar year.
+    if payload.start_date.year != payload.end_date.year:
+        raise HTTPException(status_code=400, detail="For MVP, leave cannot span multiple calendar years.")
+
+    available = max(emp.annual_balance - emp.used, 0)
+    if days > available:
+        raise HTTPException(status_code=400, detail=f"Requested {days} days exceeds available balance {available}.")
+
+    leave = Leave(
+        employee_id=emp.id,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        days=days,
+        reason=payload.reason,
+        status=LeaveStatus.pending.value,
+    )
+    sess.add(leave)
+    await sess.commit()
+    await sess.refresh(leave)
+    return leave
 
 @app.post("/leaves/{leave_id}/decision", response_model=LeaveOut)
-def decide_leave(leave_id: int, action: LeaveAction):
-    sess = SessionLocal()
-    try:
-        leave = sess.query(Leave).filter_by(id=leave_id).first()
-        if not leave:
-            raise HTTPException(status_code=404, detail="Leave request not found.")
-        if leave.status != LeaveStatus.pending:
-            raise HTTPException(status_code=409, detail=f"Leave already {leave.status}.")
-
-        emp = sess.query(Employee).filter_by(id=leave.employee_id).first()
-        if not emp:
-            raise HTTPException(status_code=404, detail="Employee not found.")
-
-        if action.approved:
-            # Re-check overlap and balance at approval time
-            if has_overlap(sess, emp.id, leave.start_date, leave.end_date):
-                # Allow overlap with itself by temporarily excluding current leave
-                # Simple approach: check overlapping OTHER leaves
-                other = sess.query(Leave).filter(
-                    Leave.employee_id == emp.id,
-                    Leave.id != leave.id,
-                    Leave.status.in_([LeaveStatus.pending, LeaveStatus.approved]),
-                    or_(and_(Leave.start_date <= leave.end_date, Leave.end_date >= leave.start_date))
-                ).first()
-                if other:
-                    raise HTTPException(status_code=409, detail="Overlaps another leave at approval time.")
-
-            days = action.days_override if action.days_override is not None else leave.days
-            if days <= 0:
-                raise HTTPException(status_code=400, detail="days_override must be positive.")
-
-            used = compute_used_days(sess, emp.id, leave.start_date.year)
-            available = max(emp.annual_balance - used, 0)
-            if days > available:
-                raise HTTPException(status_code=400, detail=f"Approval exceeds available balance ({available}).")
-
-            leave.days = days
-            leave.status = LeaveStatus.approved
-        else:
-            leave.status = LeaveStatus.rejected
-
-        sess.add(leave)
-        sess.commit()
-        sess.refresh(leave)
-        return leave
-    finally:
-        sess.close()
+async def decide_leave(leave_id: int, action: LeaveAction, sess: AsyncSession = Depends(get_db)):
+    row = (await sess.execute(
+        select(Leave, Employee.annual_balance)
+        .outerjoin(Employee, Employee.id == Leave.employee_id)
+        .where(Leave.id == leave_id)
+    )).one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Leave request not found.")
+    leave, annual_balance = row
+    if leave.status != LeaveStatus.pending.value:
+        raise HTTPException(status_code=409, detail=f"Leave already {leave.status}.")
+    if annual_balance is None:
+        raise HTTPException(status_code=404, detail="Employee not found.")
+
+    if action.approved:
+        # Re-check overlap against OTHER leaves at approval time
+        if await has_overlap(sess, leave.employee_id, leave.start_date, leave.end_date, exclude_id=leave.id):
+            raise HTTPException(status_code=409, detail="Overlaps another leave at approval time.")
+
+        days = action.days_override if action.days_override is not None else leave.days
+        if days <= 0:
+            raise HTTPException(status_code=400, detail="days_override must be positive.")
+
+        # Balance check and increment in one statement, so concurrent approvals cannot overspend
+        emp_id, year = leave.employee_id, leave.start_date.year  # rollback expires `leave`
+        if not await add_used_days(sess, emp_id, leave.start_date, leave.end_date, days, annual_balance):
+            await sess.rollback()
+            used = await compute_used_days(sess, emp_id, year)
+            available = max(annual_balance - used, 0)
+            raise HTTPException(status_code=400, detail=f"Approval exceeds available balance ({available}).")
+        values = {"status": LeaveStatus.approved.value, "days": days}
+    else:
+        values = {"status": LeaveStatus.rejected.value}
+
+    # Only a still-pending leave can be decided; guards against a concurrent decision on the same leave
+    result = await sess.execute(
+        update(Leave).where(Leave.id == leave.id, Leave.status == LeaveStatus.pending.value).values(**values)
+    )
+    if result.rowcount == 0:
+        await sess.rollback()
+        raise HTTPException(status_code=409, detail="Leave was already decided.")
+    await sess.commit()
+    return leave
 
 @app.get("/leaves", response_model=List[LeaveOut])
-def list_leaves(employee_id: Optional[int] = None, status: Optional[LeaveStatus] = None):
-    sess = SessionLocal()
-    try:
-        q = sess.query(Leave)
-        if employee_id is not None:
-            q = q.filter(Leave.employee_id == employee_id)
-        if status is not None:
-            q = q.filter(Leave.status == status)
-        q = q.order_by(Leave.created_at.desc())
-        return q.all()
-    finally:
-        sess.close()
+async def list_leaves(employee_id: Optional[int] = None, status: Optional[LeaveStatus] = None, sess: AsyncSession = Depends(get_db)):
+    # Read-only: select plain columns, skipping ORM hydration; response_model validates each row mapping once
+    q = select(
+        Leave.id, Leave.employee_id, Leave.start_date, Leave.end_date, Leave.days, Leave.reason, Leave.status,
+    )
+    if employee_id is not None:
+        q = q.where(Leave.employee_id == employee_id)
+    if status is not None:
+        q = q.where(Leave.status == status.value)
+    # id breaks ties: SQLite's CURRENT_TIMESTAMP only has second resolution
+    q = q.order_by(Leave.created_at.desc(), Leave.id.desc())
+    return (await sess.execute(q)).mappings().all()
+
+@app.post("/leaves/recompute-days", response_model=RecomputeOut)
+async def recompute_leave_days(sess: AsyncSession = Depends(get_db)):
+    """Admin backfill: recount `days` of PENDING leaves from their dates (e.g. after a working-day rule change).
+    Approved leaves are left untouched: their days may carry a manager override and already count towards balances."""
+    rows = (await sess.execute(
+        select(Leave.id, Leave.start_date, Leave.end_date, Leave.days).where(Leave.status == LeaveStatus.pending.value)
+    )).all()
+    recomputed = working_days_bulk([r.start_date for r in rows], [r.end_date for r in rows])
+    changes = [{"b_id": r.id, "b_days": d} for r, d in zip(rows, recomputed) if d != r.days]
+    updated = 0
+    if changes:
+        # The status guard skips leaves decided since the SELECT, like decide_leave's UPDATE does
+        stmt = (
+            update(Leave.__table__)
+            .where(Leave.id == bindparam("b_id"), Leave.status == LeaveStatus.pending.value)
+            .values(days=bindparam("b_days"))
+        )
+        if engine.dialect.supports_sane_multi_rowcount:
+            updated = (await sess.execute(stmt, changes)).rowcount  # one executemany
+        else:
+            # asyncpg reports no rowcount for executemany; count the rows one statement at a time
+            for change in changes:
+                updated += (await sess.execute(stmt, change)).rowcount
+        await sess.commit()
+    return RecomputeOut(checked=len(rows), updated=updated)
@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+
+import httpx
+import pytest
+
+# Point the app at a throwaway SQLite file before main is imported
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test_leave_mvp.sqlite3"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def empty_db():
+    """Every test starts without tables; lifespan (or the test itself) creates them."""
+    async with main.engine.begin() as conn:
+        await conn.run_sync(main.Base.metadata.drop_all)
+    yield
+    await main.engine.dispose()
+
+
+@pytest.fixture
+async def client(empty_db):
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
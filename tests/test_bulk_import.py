@@ -0,0 +1,44 @@
+"""bulk_create_leaves must skip rows already imported and count approved days once."""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+import main
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_reimport_with_same_ids_does_not_double_count(client):
+    emp = (await client.post("/employees", json={
+        "name": "Imported", "email": "imported@example.com", "department": "HR", "joining_date": "2020-01-01",
+    })).json()["id"]
+    approved, pending = main.LeaveStatus.approved.value, main.LeaveStatus.pending.value
+    rows = [
+        # Mon-Fri, days computed from the dates: 5
+        {"id": 101, "employee_id": emp, "start_date": date(2025, 3, 3), "end_date": date(2025, 3, 7), "status": approved},
+        # Explicit days (a manager override) are kept as given
+        {"id": 102, "employee_id": emp, "start_date": date(2025, 4, 7), "end_date": date(2025, 4, 9), "days": 2,
+         "status": approved},
+        # Spans the new year: Tue Dec 30 and Wed Dec 31 2025, Thu Jan 1 and Fri Jan 2 2026
+        {"id": 103, "employee_id": emp, "start_date": date(2025, 12, 30), "end_date": date(2026, 1, 2),
+         "status": approved},
+        {"id": 104, "employee_id": emp, "start_date": date(2025, 5, 5), "end_date": date(2025, 5, 5), "status": pending},
+    ]
+
+    async def balance(year):
+        return (await client.get(f"/employees/{emp}/balance", params={"year": year})).json()["used_days"]
+
+    for attempt in range(2):
+        batch = rows if attempt == 0 else rows + [  # the re-run also carries one genuinely new row
+            {"id": 105, "employee_id": emp, "start_date": date(2025, 6, 2), "end_date": date(2025, 6, 3),
+             "status": approved},
+        ]
+        async with main.SessionLocal() as sess:
+            await main.bulk_create_leaves(sess, batch)
+
+    async with main.SessionLocal() as sess:
+        assert (await sess.execute(select(func.count()).select_from(main.Leave))).scalar() == 5
+        assert (await sess.get(main.Leave, 102)).days == 2
+    assert await balance(2025) == 5 + 2 + 2 + 2
+    assert await balance(2026) == 2
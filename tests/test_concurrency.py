@@ -0,0 +1,63 @@
+"""Concurrent writes against the default SQLite backend must neither fail nor over-spend balances."""
+from datetime import date, timedelta
+
+import anyio
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def _monday(week: int) -> date:
+    return date(2025, 1, 6) + timedelta(weeks=week)
+
+
+async def _run_all(*calls):
+    results = []
+
+    async def run(call):
+        results.append(await call())
+
+    async with anyio.create_task_group() as tg:
+        for call in calls:
+            tg.start_soon(run, call)
+    return results
+
+
+async def test_concurrent_employees_applies_and_approvals(client):
+    responses = await _run_all(*(
+        lambda i=i: client.post("/employees", json={
+            "name": f"Emp {i}", "email": f"emp{i}@example.com", "department": "Eng", "joining_date": "2024-01-01",
+        })
+        for i in range(20)
+    ))
+    assert [r.status_code for r in responses] == [201] * 20
+    emp_ids = [r.json()["id"] for r in responses]
+
+    # Five one-week (5 day) requests for the first employee: only four fit in the 20-day allocation
+    spender = emp_ids[0]
+    pending = []
+    for week in range(5):
+        r = await client.post("/leaves/apply", json={
+            "employee_id": spender, "start_date": str(_monday(week)), "end_date": str(_monday(week) + timedelta(days=4)),
+        })
+        assert r.status_code == 201
+        pending.append(r.json()["id"])
+
+    applies = [
+        lambda emp=emp, week=week: client.post("/leaves/apply", json={
+            "employee_id": emp, "start_date": str(_monday(week)), "end_date": str(_monday(week)),
+        })
+        for emp in emp_ids[1:] for week in range(3)
+    ]
+    approvals = [
+        lambda leave_id=leave_id: client.post(f"/leaves/{leave_id}/decision", json={"approved": True})
+        for leave_id in pending
+    ]
+    responses = await _run_all(*applies, *approvals)
+    codes = [r.status_code for r in responses]
+    assert codes.count(201) == len(applies)
+    assert sorted(c for c in codes if c != 201) == [200, 200, 200, 200, 400]
+
+    balance = (await client.get(f"/employees/{spender}/balance", params={"year": 2025})).json()
+    approved = (await client.get("/leaves", params={"employee_id": spender, "status": "approved"})).json()
+    assert balance["used_days"] == sum(lv["days"] for lv in approved) == 20
@@ -0,0 +1,43 @@
+"""POST /leaves/recompute-days must only rewrite leaves that are still pending when it writes."""
+import sqlite3
+
+import pytest
+
+import main
+
+pytestmark = pytest.mark.anyio
+
+
+def _db_path() -> str:
+    return main.DATABASE_URL.split(":///", 1)[1]
+
+
+async def test_recompute_skips_leaves_approved_meanwhile(client, monkeypatch):
+    emp = (await client.post("/employees", json={
+        "name": "Recount", "email": "recount@example.com", "department": "Ops", "joining_date": "2024-01-01",
+    })).json()["id"]
+    ids = []
+    for start, end in (("2025-02-03", "2025-02-05"), ("2025-03-03", "2025-03-05")):  # Mon-Wed: 3 days each
+        r = await client.post("/leaves/apply", json={"employee_id": emp, "start_date": start, "end_date": end})
+        assert r.status_code == 201
+        ids.append(r.json()["id"])
+    stale, raced = ids
+    with sqlite3.connect(_db_path()) as db:  # as if recorded under an older working-day rule
+        db.execute("UPDATE leaves SET days = 9")
+
+    counter = main.working_days_bulk
+
+    def approve_then_count(starts, ends):
+        # A manager approves `raced` with an override between the endpoint's SELECT and its UPDATE
+        with sqlite3.connect(_db_path()) as db:
+            db.execute("UPDATE leaves SET status = 'approved', days = 2 WHERE id = ?", (raced,))
+        return counter(starts, ends)
+
+    monkeypatch.setattr(main, "working_days_bulk", approve_then_count)
+    r = await client.post("/leaves/recompute-days")
+    assert r.status_code == 200
+    assert r.json() == {"checked": 2, "updated": 1}
+
+    leaves = {lv["id"]: lv for lv in (await client.get("/leaves", params={"employee_id": emp})).json()}
+    assert leaves[stale]["days"] == 3
+    assert leaves[raced]["days"] == 2 and leaves[raced]["status"] == "approved"
@@ -0,0 +1,84 @@
+"""A database created by the original schema must keep accepting writes after startup migrations."""
+from datetime import date
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+import main
+
+pytestmark = pytest.mark.anyio
+
+# DDL emitted by create_all for the pre-series models (naive timestamps with Python-side defaults only)
+BASELINE_SCHEMA = [
+    """CREATE TABLE employees (
+        id INTEGER NOT NULL,
+        name VARCHAR NOT NULL,
+        email VARCHAR NOT NULL,
+        department VARCHAR NOT NULL,
+        joining_date DATE NOT NULL,
+        annual_balance INTEGER NOT NULL,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX ix_employees_id ON employees (id)",
+    "CREATE UNIQUE INDEX ix_employees_email ON employees (email)",
+    """CREATE TABLE leaves (
+        id INTEGER NOT NULL,
+        employee_id INTEGER NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        days INTEGER NOT NULL,
+        reason VARCHAR,
+        status VARCHAR(8) NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(employee_id) REFERENCES employees (id)
+    )""",
+    "CREATE INDEX ix_leaves_id ON leaves (id)",
+    "CREATE INDEX ix_leaves_employee_id ON leaves (employee_id)",
+]
+
+
+@pytest.fixture
+async def baseline_db(empty_db):
+    async with main.engine.begin() as conn:
+        for ddl in BASELINE_SCHEMA:
+            await conn.exec_driver_sql(ddl)
+        await conn.exec_driver_sql(
+            "INSERT INTO employees (id, name, email, department, joining_date, annual_balance)"
+            " VALUES (1, 'Old Timer', 'old@example.com', 'Ops', '2020-01-01', 20)"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO leaves (id, employee_id, start_date, end_date, days, reason, status, created_at, updated_at)"
+            " VALUES (1, 1, '2025-03-03', '2025-03-04', 2, NULL, 'approved',"
+            " '2025-02-01 09:00:00.000000', '2025-02-01 09:00:00.000000')"
+        )
+
+
+async def test_apply_and_decide_on_baseline_schema(baseline_db):
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            balance = (await client.get("/employees/1/balance", params={"year": 2025})).json()
+            assert balance["used_days"] == 2  # backfilled from the pre-existing approved leave
+
+            r = await client.post("/leaves/apply", json={
+                "employee_id": 1, "start_date": "2025-04-07", "end_date": "2025-04-09",
+            })
+            assert r.status_code == 201, r.text
+            leave_id = r.json()["id"]
+
+            r = await client.post(f"/leaves/{leave_id}/decision", json={"approved": True})
+            assert r.status_code == 200, r.text
+            balance = (await client.get("/employees/1/balance", params={"year": 2025})).json()
+            assert balance["used_days"] == 5
+
+        async with main.SessionLocal() as sess:
+            await main.bulk_create_leaves(sess, [{
+                "employee_id": 1, "start_date": date(2025, 6, 2), "end_date": date(2025, 6, 2),
+                "status": main.LeaveStatus.pending.value,
+            }])
+            stamps = (await sess.execute(select(main.Leave.created_at, main.Leave.updated_at))).all()
+    assert len(stamps) == 3
+    assert all(created is not None and updated is not None for created, updated in stamps)
@@ -0,0 +1,79 @@
+"""The working-day counters must agree with a plain day-by-day count."""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import main
+
+
+def brute_force(start: date, end: date) -> int:
+    return sum(1 for i in range((end - start).days + 1) if (start + timedelta(days=i)).weekday() < 5)
+
+
+def random_ranges(n: int, max_len: int, seed: int = 0):
+    rng = random.Random(seed)
+    first, span = date(1999, 1, 1), (date(2031, 12, 31) - date(1999, 1, 1)).days
+    for _ in range(n):
+        start = first + timedelta(days=rng.randrange(span))
+        yield start, start + timedelta(days=rng.randrange(max_len))
+
+
+def test_working_days_every_start_weekday_and_length():
+    monday = date(2025, 1, 6)
+    for offset in range(7):
+        start = monday + timedelta(days=offset)
+        for length in range(30):
+            end = start + timedelta(days=length)
+            assert main.working_days(start, end) == brute_force(start, end), (start, end)
+
+
+def test_working_days_random_ranges():
+    for start, end in random_ranges(5000, 800):
+        assert main.working_days(start, end) == brute_force(start, end), (start, end)
+
+
+def test_working_days_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        main.working_days(date(2025, 1, 7), date(2025, 1, 6))
+
+
+@pytest.fixture(params=["numpy", "pure-python"])
+def bulk_backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(main, "np", None)
+    return request.param
+
+
+def test_working_days_bulk_random_ranges(bulk_backend):
+    ranges = list(random_ranges(5000, 800, seed=1))
+    counts = main.working_days_bulk([s for s, _ in ranges], [e for _, e in ranges])
+    assert counts == [brute_force(s, e) for s, e in ranges]
+
+
+def test_working_days_bulk_rejects_reversed_range(bulk_backend):
+    with pytest.raises(ValueError):
+        main.working_days_bulk([date(2025, 1, 6), date(2025, 1, 7)], [date(2025, 1, 6), date(2025, 1, 6)])
+
+
+def test_working_days_in_year_random_ranges():
+    for start, end in random_ranges(5000, 400, seed=2):
+        end = min(end, date(start.year, 12, 31))
+        assert main.working_days_in_year(start, end) == brute_force(start, end), (start, end)
+
+
+@pytest.mark.parametrize("year", [1999, 2000, 2023, 2024, 2100])  # leap, century and plain years
+def test_working_days_in_year_whole_year_and_edges(year):
+    jan1, dec31 = date(year, 1, 1), date(year, 12, 31)
+    assert main.working_days_in_year(jan1, dec31) == brute_force(jan1, dec31)
+    assert main.working_days_in_year(jan1, jan1) == brute_force(jan1, jan1)
+    assert main.working_days_in_year(dec31, dec31) == brute_force(dec31, dec31)
+
+
+def test_working_days_in_year_rejects_invalid_ranges():
+    with pytest.raises(ValueError):
+        main.working_days_in_year(date(2025, 12, 31), date(2026, 1, 2))
+    with pytest.raises(ValueError):
+        main.working_days_in_year(date(2025, 1, 7), date(2025, 1, 6))